@@ -91,7 +91,7 @@ async def get_stock_data(symbol: str, days: int = Query(365, ge=1, le=1000)):
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No data found for symbol {symbol}")
         latest_price = df['Close'].iloc[-1]
-        prices = [{"date": idx.isoformat(), "open": float(row['Open']), "high": float(row['High']), "low": float(row['Low']), "close": float(row['Close']), "volume": int(row['Volume'])} for idx, row in df.iterrows()]
+        prices = [{"date": idx.isoformat(), "open": float(o), "high": float(h), "low": float(l), "close": float(c), "volume": int(v)} for idx, o, h, l, c, v in zip(df.index.to_pydatetime(), df['Open'].tolist(), df['High'].tolist(), df['Low'].tolist(), df['Close'].tolist(), df['Volume'].tolist())]
         logger.info(f"Retrieved {len(prices)} days of data for {symbol}")
         return {"symbol": symbol.upper(), "prices": prices, "current_price": float(latest_price), "currency": "USD", "last_updated": datetime.now().isoformat(), "data_points": len(prices)}
     except HTTPException:
@@ -313,7 +313,7 @@ async def get_indian_stock_data(symbol: str, days: int = Query(365, ge=1, le=100
         if df.empty:
             raise HTTPException(status_code=404, detail=f"No data found for Indian stock {symbol}")
         latest_price = df['Close'].iloc[-1]
-        prices = [{"date": idx.isoformat(), "open": float(row['Open']), "high": float(row['High']), "low": float(row['Low']), "close": float(row['Close']), "volume": int(row['Volume'])} for idx, row in df.iterrows()]
+        prices = [{"date": idx.isoformat(), "open": float(o), "high": float(h), "low": float(l), "close": float(c), "volume": int(v)} for idx, o, h, l, c, v in zip(df.index.to_pydatetime(), df['Open'].tolist(), df['High'].tolist(), df['Low'].tolist(), df['Close'].tolist(), df['Volume'].tolist())]
         logger.info(f"Retrieved {len(prices)} days of data for Indian stock {symbol}")
         return {"symbol": symbol.upper(), "prices": prices, "current_price_inr": float(latest_price), "currency": "INR", "exchange": "NSE", "last_updated": datetime.now().isoformat(), "data_points": len(prices)}
     except HTTPException:
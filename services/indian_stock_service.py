@@ -1,6 +1,7 @@
 import yfinance as yf
 import pandas as pd
 import logging
+from datetime import date
 from typing import Optional, Dict, List
 
 logger = logging.getLogger(__name__)
@@ -65,6 +66,8 @@ class IndianStockService:
     def validate_indian_symbol(self, symbol: str) -> bool:
         """Validate if Indian stock symbol is valid"""
         try:
+            if symbol.upper() in self.indian_stocks:
+                return True
             nse_symbol = self.get_nse_symbol(symbol)
             if not nse_symbol:
                 return False
@@ -81,9 +84,10 @@ class IndianStockService:
             nse_symbol = self.get_nse_symbol(symbol)
             
             cache_key = f"{nse_symbol}_{days}"
-            if cache_key in self.cache:
+            today = date.today()
+            if cache_key in self.cache and self.cache[cache_key][0] == today:
                 logger.info(f"Using cached data for {nse_symbol}")
-                return self.cache[cache_key]
+                return self.cache[cache_key][1]
             
             ticker = yf.Ticker(nse_symbol)
             period = f"{days}d"
@@ -93,7 +97,7 @@ class IndianStockService:
                 logger.warning(f"No data found for Indian stock {nse_symbol}")
                 return pd.DataFrame()
             
-            self.cache[cache_key] = df
+            self.cache[cache_key] = (today, df)
             logger.info(f"Retrieved {len(df)} rows of data for {nse_symbol}")
             return df
         
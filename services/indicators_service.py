@@ -1,21 +1,35 @@
 import pandas as pd
 import numpy as np
 import logging
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional
 
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=32)
+def _ewm_weights(length: int, span: int) -> np.ndarray:
+    """Weights w such that w @ x equals the last value of ewm(span, adjust=False)"""
+    alpha = 2 / (span + 1)
+    weights = alpha * (1 - alpha) ** np.arange(length - 1, -1, -1)
+    weights[0] = (1 - alpha) ** (length - 1)
+    weights.flags.writeable = False
+    return weights
+
+_CACHE_SIZE = 128
+
 class IndicatorsService:
     """Service for calculating technical indicators"""
     
     def __init__(self):
+        self.cache = OrderedDict()
         logger.info("Initializing IndicatorsService")
     
     def calculate_sma(self, prices: List[float], window: int = 20) -> List[float]:
         """Calculate Simple Moving Average"""
         try:
-            df = pd.DataFrame({'price': prices})
-            sma = df['price'].rolling(window=window, min_periods=1).mean()
+            price = pd.Series(prices)
+            sma = price.rolling(window=window, min_periods=1).mean()
             return sma.tolist()
         except Exception as e:
             logger.error(f"Error calculating SMA: {e}")
@@ -24,18 +38,32 @@ class IndicatorsService:
     def calculate_ema(self, prices: List[float], span: int = 20) -> List[float]:
         """Calculate Exponential Moving Average"""
         try:
-            df = pd.DataFrame({'price': prices})
-            ema = df['price'].ewm(span=span, adjust=False).mean()
+            price = pd.Series(prices)
+            ema = price.ewm(span=span, adjust=False).mean()
             return ema.tolist()
         except Exception as e:
             logger.error(f"Error calculating EMA: {e}")
             return []
     
+    def calculate_latest_ema(self, prices: List[float], span: int = 20) -> Optional[float]:
+        """Calculate only the latest Exponential Moving Average value"""
+        try:
+            if len(prices) == 0:
+                return None
+            values = np.asarray(prices, dtype=np.float64)
+            if not np.isfinite(values).all():
+                # ewm skips missing bars, which a fixed weight vector cannot do
+                return float(pd.Series(values).ewm(span=span, adjust=False).mean().iloc[-1])
+            return float(_ewm_weights(len(values), span) @ values)
+        except Exception as e:
+            logger.error(f"Error calculating latest EMA: {e}")
+            return None
+    
     def calculate_rsi(self, prices: List[float], window: int = 14) -> Tuple[List[float], List[bool], List[bool]]:
         """Calculate Relative Strength Index"""
         try:
-            df = pd.DataFrame({'price': prices})
-            delta = df['price'].diff()
+            price = pd.Series(prices)
+            delta = price.diff()
             
             gain = (delta.where(delta > 0, 0)).rolling(window=window, min_periods=1).mean()
             loss = (-delta.where(delta < 0, 0)).rolling(window=window, min_periods=1).mean()
@@ -54,10 +82,10 @@ class IndicatorsService:
     def calculate_macd(self, prices: List[float], fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[List[float], List[float], List[float]]:
         """Calculate MACD (Moving Average Convergence Divergence)"""
         try:
-            df = pd.DataFrame({'price': prices})
+            price = pd.Series(prices)
             
-            ema_fast = df['price'].ewm(span=fast, adjust=False).mean()
-            ema_slow = df['price'].ewm(span=slow, adjust=False).mean()
+            ema_fast = price.ewm(span=fast, adjust=False).mean()
+            ema_slow = price.ewm(span=slow, adjust=False).mean()
             
             macd_line = ema_fast - ema_slow
             signal_line = macd_line.ewm(span=signal, adjust=False).mean()
@@ -71,10 +99,10 @@ class IndicatorsService:
     def calculate_bollinger_bands(self, prices: List[float], window: int = 20, num_std: float = 2) -> Tuple[List[float], List[float], List[float]]:
         """Calculate Bollinger Bands"""
         try:
-            df = pd.DataFrame({'price': prices})
+            price = pd.Series(prices)
             
-            sma = df['price'].rolling(window=window, min_periods=1).mean()
-            std = df['price'].rolling(window=window, min_periods=1).std()
+            sma = price.rolling(window=window, min_periods=1).mean()
+            std = price.rolling(window=window, min_periods=1).std()
             
             upper_band = sma + (std * num_std)
             lower_band = sma - (std * num_std)
@@ -87,12 +115,14 @@ class IndicatorsService:
     def calculate_stochastic(self, high: List[float], low: List[float], close: List[float], window: int = 14) -> Tuple[List[float], List[float]]:
         """Calculate Stochastic Oscillator"""
         try:
-            df = pd.DataFrame({'high': high, 'low': low, 'close': close})
+            highs = pd.Series(high)
+            lows = pd.Series(low)
+            closes = pd.Series(close)
             
-            lowest_low = df['low'].rolling(window=window, min_periods=1).min()
-            highest_high = df['high'].rolling(window=window, min_periods=1).max()
+            lowest_low = lows.rolling(window=window, min_periods=1).min()
+            highest_high = highs.rolling(window=window, min_periods=1).max()
             
-            k = 100 * (df['close'] - lowest_low) / (highest_high - lowest_low)
+            k = 100 * (closes - lowest_low) / (highest_high - lowest_low)
             d = k.rolling(window=3, min_periods=1).mean()
             
             return k.fillna(50).tolist(), d.fillna(50).tolist()
@@ -103,11 +133,13 @@ class IndicatorsService:
     def calculate_atr(self, high: List[float], low: List[float], close: List[float], window: int = 14) -> List[float]:
         """Calculate Average True Range"""
         try:
-            df = pd.DataFrame({'high': high, 'low': low, 'close': close})
+            highs = pd.Series(high)
+            lows = pd.Series(low)
+            closes = pd.Series(close)
             
-            high_low = df['high'] - df['low']
-            high_close = abs(df['high'] - df['close'].shift())
-            low_close = abs(df['low'] - df['close'].shift())
+            high_low = highs - lows
+            high_close = abs(highs - closes.shift())
+            low_close = abs(lows - closes.shift())
             
             true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
             atr = true_range.rolling(window=window, min_periods=1).mean()
@@ -124,15 +156,22 @@ class IndicatorsService:
                 logger.warning("Empty DataFrame provided")
                 return None
             
-            prices = df['Close'].tolist()
-            high = df['High'].tolist()
-            low = df['Low'].tolist()
+            # Check cache first
+            cache_key = (len(df), int(pd.util.hash_pandas_object(df[['High', 'Low', 'Close']], index=True).sum()))
+            if cache_key in self.cache:
+                logger.info("Using cached indicators")
+                self.cache.move_to_end(cache_key)
+                return dict(self.cache[cache_key])
+            
+            prices = df['Close'].to_numpy()
+            high = df['High'].to_numpy()
+            low = df['Low'].to_numpy()
             
             # Calculate all indicators
             sma_20 = self.calculate_sma(prices, 20)
             sma_50 = self.calculate_sma(prices, 50)
-            ema_20 = self.calculate_ema(prices, 20)
-            ema_50 = self.calculate_ema(prices, 50)
+            ema_20 = self.calculate_latest_ema(prices, 20)
+            ema_50 = self.calculate_latest_ema(prices, 50)
             
             rsi_values, overbought, oversold = self.calculate_rsi(prices, 14)
             macd_line, signal_line, histogram = self.calculate_macd(prices)
@@ -144,8 +183,8 @@ class IndicatorsService:
             indicators = {
                 'sma_20': sma_20[-1] if sma_20 else None,
                 'sma_50': sma_50[-1] if sma_50 else None,
-                'ema_20': ema_20[-1] if ema_20 else None,
-                'ema_50': ema_50[-1] if ema_50 else None,
+                'ema_20': ema_20,
+                'ema_50': ema_50,
                 'rsi': rsi_values[-1] if rsi_values else None,
                 'rsi_overbought': overbought[-1] if overbought else False,
                 'rsi_oversold': oversold[-1] if oversold else False,
@@ -158,7 +197,7 @@ class IndicatorsService:
                 'stochastic_k': stoch_k[-1] if stoch_k else None,
                 'stochastic_d': stoch_d[-1] if stoch_d else None,
                 'atr': atr[-1] if atr else None,
-                'current_price': prices[-1] if prices else None,
+                'current_price': float(prices[-1]) if len(prices) else None,
             }
             
             # Fixed logging statement
@@ -166,7 +205,10 @@ class IndicatorsService:
             macd_str = f"{indicators['macd']:.2f}" if indicators['macd'] is not None else "N/A"
             logger.info(f"Calculated indicators: RSI={rsi_str}, MACD={macd_str}")
             
-            return indicators
+            self.cache[cache_key] = indicators
+            if len(self.cache) > _CACHE_SIZE:
+                self.cache.popitem(last=False)
+            return dict(indicators)
             
         except Exception as e:
             logger.error(f"Error calculating all indicators: {e}")
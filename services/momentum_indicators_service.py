@@ -3,8 +3,30 @@ import numpy as np
 from typing import List, Tuple
 import logging
 
+from services._njit import njit
+
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _cci_kernel(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray, window: int) -> np.ndarray:
+    n = closes.shape[0]
+    typical_prices = (highs + lows + closes) / 3
+    out = np.empty(n - window + 1)
+    for i in range(window - 1, n):
+        total = 0.0
+        for j in range(i - window + 1, i + 1):
+            total += typical_prices[j]
+        sma = total / window
+        deviation = 0.0
+        for j in range(i - window + 1, i + 1):
+            deviation += abs(typical_prices[j] - sma)
+        mad = deviation / window
+        if mad == 0:
+            out[i - window + 1] = 0.0
+        else:
+            out[i - window + 1] = (typical_prices[i] - sma) / (0.015 * mad)
+    return out
+
 class MomentumIndicatorsService:
     @staticmethod
     def calculate_stochastic(prices: List[float], window: int = 14, smooth_k: int = 3, smooth_d: int = 3) -> Tuple[List[float], List[float]]:
@@ -57,13 +79,11 @@ class MomentumIndicatorsService:
         try:
             if len(prices) < window + 1:
                 return []
-            roc = []
-            for i in range(window, len(prices)):
-                if prices[i - window] == 0:
-                    roc_value = 0
-                else:
-                    roc_value = ((prices[i] - prices[i - window]) / prices[i - window]) * 100
-                roc.append(roc_value)
+            prices = np.asarray(prices, dtype=np.float64)
+            current = prices[window:]
+            previous = prices[:len(prices) - window]
+            roc = np.divide(current - previous, previous, out=np.zeros_like(current), where=previous != 0) * 100
+            roc = roc.tolist()
             logger.info(f"Calculated ROC with {len(roc)} data points")
             return roc
         except Exception as e:
@@ -75,10 +95,8 @@ class MomentumIndicatorsService:
         try:
             if len(prices) < window + 1:
                 return []
-            momentum = []
-            for i in range(window, len(prices)):
-                momentum_value = prices[i] - prices[i - window]
-                momentum.append(momentum_value)
+            prices = np.asarray(prices, dtype=np.float64)
+            momentum = (prices[window:] - prices[:len(prices) - window]).tolist()
             logger.info(f"Calculated Momentum with {len(momentum)} data points")
             return momentum
         except Exception as e:
@@ -90,16 +108,12 @@ class MomentumIndicatorsService:
         try:
             if len(closes) < window:
                 return []
-            cci = []
-            for i in range(window - 1, len(closes)):
-                typical_price = (highs[i] + lows[i] + closes[i]) / 3
-                sma = sum([(highs[j] + lows[j] + closes[j]) / 3 for j in range(i-window+1, i+1)]) / window
-                mad = sum([abs((highs[j] + lows[j] + closes[j]) / 3 - sma) for j in range(i-window+1, i+1)]) / window
-                if mad == 0:
-                    cci_value = 0
-                else:
-                    cci_value = (typical_price - sma) / (0.015 * mad)
-                cci.append(cci_value)
+            cci = _cci_kernel(
+                np.asarray(highs, dtype=np.float64),
+                np.asarray(lows, dtype=np.float64),
+                np.asarray(closes, dtype=np.float64),
+                window,
+            ).tolist()
             logger.info(f"Calculated CCI with {len(cci)} data points")
             return cci
         except Exception as e:
@@ -1,6 +1,7 @@
 import yfinance as yf
 import pandas as pd
 import logging
+from datetime import date
 from typing import Optional, Dict, List
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,8 @@ class StockService:
         try:
             if not symbol or len(symbol) < 1:
                 return False
+            if symbol in self.valid_symbols:
+                return True
             # Try to fetch basic info to validate symbol
             ticker = yf.Ticker(symbol)
             info = ticker.info
@@ -31,9 +34,10 @@ class StockService:
             
             # Check cache first
             cache_key = f"{symbol}_{days}"
-            if cache_key in self.cache:
+            today = date.today()
+            if cache_key in self.cache and self.cache[cache_key][0] == today:
                 logger.info(f"Using cached data for {symbol}")
-                return self.cache[cache_key]
+                return self.cache[cache_key][1]
             
             # Fetch data from yfinance
             ticker = yf.Ticker(symbol)
@@ -45,7 +49,7 @@ class StockService:
                 return pd.DataFrame()
             
             # Cache the data
-            self.cache[cache_key] = df
+            self.cache[cache_key] = (today, df)
             logger.info(f"Retrieved {len(df)} rows of data for {symbol}")
             return df
         
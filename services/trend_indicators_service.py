@@ -1,67 +1,73 @@
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Dict, Tuple
 import logging
 
+from services._njit import njit
+from services.volatility_indicators_service import _true_range
+
 logger = logging.getLogger(__name__)
 
+@njit(cache=True)
+def _adx_kernel(tr: np.ndarray, plus_dm: np.ndarray, minus_dm: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    n = tr.shape[0] - window + 1
+    adx = np.empty(n)
+    plus_di = np.empty(n)
+    minus_di = np.empty(n)
+    tr_sum = tr[:window].sum()
+    plus_dm_sum = plus_dm[:window].sum()
+    minus_dm_sum = minus_dm[:window].sum()
+    for k in range(n):
+        i = k + window - 1
+        if i >= window:
+            tr_sum = tr_sum - tr[i - window] + tr[i]
+            plus_dm_sum = plus_dm_sum - plus_dm[i - window] + plus_dm[i]
+            minus_dm_sum = minus_dm_sum - minus_dm[i - window] + minus_dm[i]
+        if tr_sum != 0:
+            plus_di_val = 100 * (plus_dm_sum / tr_sum)
+            minus_di_val = 100 * (minus_dm_sum / tr_sum)
+        else:
+            plus_di_val = 0.0
+            minus_di_val = 0.0
+        plus_di[k] = plus_di_val
+        minus_di[k] = minus_di_val
+        di_sum = plus_di_val + minus_di_val
+        if di_sum != 0:
+            dx = 100 * abs(plus_di_val - minus_di_val) / di_sum
+        else:
+            dx = 0.0
+        if k < window:
+            adx[k] = dx
+        else:
+            adx[k] = (adx[k - 1] * (window - 1) + dx) / window
+    return adx, plus_di, minus_di
+
+def _rolling_midpoint(highs: np.ndarray, lows: np.ndarray, window: int) -> np.ndarray:
+    # Same NaN handling as max()/min() over each slice: NaN only when the
+    # window starts on a NaN bar, otherwise NaN bars are skipped.
+    high_windows = sliding_window_view(highs, window)
+    low_windows = sliding_window_view(lows, window)
+    highest = np.where(np.isnan(high_windows[:, 0]), np.nan, np.fmax.reduce(high_windows, axis=1))
+    lowest = np.where(np.isnan(low_windows[:, 0]), np.nan, np.fmin.reduce(low_windows, axis=1))
+    return (highest + lowest) / 2
+
 class TrendIndicatorsService:
     @staticmethod
     def calculate_adx(highs: List[float], lows: List[float], closes: List[float], window: int = 14) -> Tuple[List[float], List[float], List[float]]:
         try:
             if len(closes) < window + 1:
                 return [], [], []
-            tr = []
-            for i in range(1, len(closes)):
-                high_low = highs[i] - lows[i]
-                high_close = abs(highs[i] - closes[i-1])
-                low_close = abs(lows[i] - closes[i-1])
-                tr_value = max(high_low, high_close, low_close)
-                tr.append(tr_value)
-            plus_dm = []
-            minus_dm = []
-            for i in range(1, len(highs)):
-                up_move = highs[i] - highs[i-1]
-                down_move = lows[i-1] - lows[i]
-                if up_move > down_move and up_move > 0:
-                    plus_dm.append(up_move)
-                    minus_dm.append(0)
-                elif down_move > up_move and down_move > 0:
-                    plus_dm.append(0)
-                    minus_dm.append(down_move)
-                else:
-                    plus_dm.append(0)
-                    minus_dm.append(0)
-            plus_di = []
-            minus_di = []
-            adx = []
-            if len(tr) >= window:
-                tr_sum = sum(tr[:window])
-                plus_dm_sum = sum(plus_dm[:window])
-                minus_dm_sum = sum(minus_dm[:window])
-                for i in range(window - 1, len(tr)):
-                    if i >= window:
-                        tr_sum = tr_sum - tr[i-window] + tr[i]
-                        plus_dm_sum = plus_dm_sum - plus_dm[i-window] + plus_dm[i]
-                        minus_dm_sum = minus_dm_sum - minus_dm[i-window] + minus_dm[i]
-                    if tr_sum != 0:
-                        plus_di_val = 100 * (plus_dm_sum / tr_sum)
-                        minus_di_val = 100 * (minus_dm_sum / tr_sum)
-                    else:
-                        plus_di_val = 0
-                        minus_di_val = 0
-                    plus_di.append(plus_di_val)
-                    minus_di.append(minus_di_val)
-                    di_sum = plus_di_val + minus_di_val
-                    if di_sum != 0:
-                        dx = 100 * abs(plus_di_val - minus_di_val) / di_sum
-                    else:
-                        dx = 0
-                    if len(adx) < window:
-                        adx.append(dx)
-                    else:
-                        adx_val = (adx[-1] * (window - 1) + dx) / window
-                        adx.append(adx_val)
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            closes = np.asarray(closes, dtype=np.float64)
+            tr = _true_range(highs, lows, closes)
+            up_move = np.diff(highs)
+            down_move = -np.diff(lows)
+            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+            adx, plus_di, minus_di = _adx_kernel(tr, plus_dm, minus_dm, window)
+            adx, plus_di, minus_di = adx.tolist(), plus_di.tolist(), minus_di.tolist()
             logger.info(f"Calculated ADX with +DI: {len(plus_di)}, -DI: {len(minus_di)}, ADX: {len(adx)}")
             return adx, plus_di, minus_di
         except Exception as e:
@@ -73,29 +79,18 @@ class TrendIndicatorsService:
         try:
             if len(closes) < window:
                 return [], []
-            hl2 = [(h + l) / 2 for h, l in zip(highs, lows)]
-            atr_values = []
-            for i in range(1, len(closes)):
-                high_low = highs[i] - lows[i]
-                high_close = abs(highs[i] - closes[i-1])
-                low_close = abs(lows[i] - closes[i-1])
-                tr = max(high_low, high_close, low_close)
-                atr_values.append(tr)
-            hl2_ma = pd.Series(hl2).rolling(window=window).mean().tolist()
-            atr_ma = pd.Series(atr_values).rolling(window=window).mean().tolist()
-            supertrend = []
-            trend = []
-            for i in range(len(hl2_ma) - len(atr_ma), len(hl2_ma)):
-                idx = i - (len(hl2_ma) - len(atr_ma))
-                if idx >= 0 and idx < len(atr_ma):
-                    upper_band = hl2_ma[i] + (multiplier * atr_ma[idx])
-                    lower_band = hl2_ma[i] - (multiplier * atr_ma[idx])
-                    if closes[i] <= upper_band:
-                        supertrend.append(upper_band)
-                        trend.append("down")
-                    else:
-                        supertrend.append(lower_band)
-                        trend.append("up")
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            closes = np.asarray(closes, dtype=np.float64)
+            hl2 = (highs + lows) / 2
+            tr = _true_range(highs, lows, closes)
+            hl2_ma = pd.Series(hl2).rolling(window=window).mean().to_numpy()[1:]
+            atr_ma = pd.Series(tr).rolling(window=window).mean().to_numpy()
+            upper_band = hl2_ma + (multiplier * atr_ma)
+            lower_band = hl2_ma - (multiplier * atr_ma)
+            is_down = closes[1:] <= upper_band
+            supertrend = np.where(is_down, upper_band, lower_band).tolist()
+            trend = np.where(is_down, "down", "up").tolist()
             logger.info(f"Calculated Supertrend with {len(supertrend)} data points")
             return supertrend, trend
         except Exception as e:
@@ -107,22 +102,14 @@ class TrendIndicatorsService:
         try:
             if len(closes) < 52:
                 return {}
-            tenkan = []
-            for i in range(8, len(closes)):
-                high_9 = max(highs[i-8:i+1])
-                low_9 = min(lows[i-8:i+1])
-                tenkan.append((high_9 + low_9) / 2)
-            kijun = []
-            for i in range(25, len(closes)):
-                high_26 = max(highs[i-25:i+1])
-                low_26 = min(lows[i-25:i+1])
-                kijun.append((high_26 + low_26) / 2)
-            senkou_a = [(tenkan[i] + kijun[i]) / 2 for i in range(len(kijun))]
-            senkou_b = []
-            for i in range(51, len(closes)):
-                high_52 = max(highs[i-51:i+1])
-                low_52 = min(lows[i-51:i+1])
-                senkou_b.append((high_52 + low_52) / 2)
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            tenkan = _rolling_midpoint(highs, lows, 9)
+            kijun = _rolling_midpoint(highs, lows, 26)
+            senkou_a = ((tenkan[:len(kijun)] + kijun) / 2).tolist()
+            senkou_b = _rolling_midpoint(highs, lows, 52).tolist()
+            tenkan = tenkan.tolist()
+            kijun = kijun.tolist()
             chikou = closes[:-26] if len(closes) > 26 else []
             logger.info(f"Calculated Ichimoku with Tenkan: {len(tenkan)}, Kijun: {len(kijun)}")
             return {"tenkan": tenkan, "kijun": kijun, "senkou_a": senkou_a, "senkou_b": senkou_b, "chikou": chikou}
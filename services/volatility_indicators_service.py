@@ -1,29 +1,43 @@
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import List, Tuple
 import logging
 
+from services._njit import njit
+
 logger = logging.getLogger(__name__)
 
+def _true_range(highs: np.ndarray, lows: np.ndarray, closes: np.ndarray) -> np.ndarray:
+    # Same NaN handling as max(high_low, high_close, low_close): only a NaN
+    # high-low range yields NaN, a NaN previous close is skipped.
+    high_low = highs[1:] - lows[1:]
+    high_close = np.abs(highs[1:] - closes[:-1])
+    low_close = np.abs(lows[1:] - closes[:-1])
+    return np.where(np.isnan(high_low), np.nan, np.fmax(np.fmax(high_low, high_close), low_close))
+
+@njit(cache=True, boundscheck=False)
+def _wilder_smooth(values: np.ndarray, window: int) -> np.ndarray:
+    n = values.shape[0]
+    out = np.empty(n - window + 1)
+    smoothed = values[:window].sum() / window
+    out[0] = smoothed
+    for i in range(window, n):
+        smoothed = (smoothed * (window - 1) + values[i]) / window
+        out[i - window + 1] = smoothed
+    return out
+
 class VolatilityIndicatorsService:
     @staticmethod
     def calculate_atr(highs: List[float], lows: List[float], closes: List[float], window: int = 14) -> List[float]:
         try:
             if len(closes) < window + 1:
                 return []
-            tr = []
-            for i in range(1, len(closes)):
-                high_low = highs[i] - lows[i]
-                high_close = abs(highs[i] - closes[i-1])
-                low_close = abs(lows[i] - closes[i-1])
-                tr_value = max(high_low, high_close, low_close)
-                tr.append(tr_value)
-            atr = []
-            if len(tr) >= window:
-                atr.append(sum(tr[:window]) / window)
-                for i in range(window, len(tr)):
-                    atr_value = (atr[-1] * (window - 1) + tr[i]) / window
-                    atr.append(atr_value)
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            closes = np.asarray(closes, dtype=np.float64)
+            tr = _true_range(highs, lows, closes)
+            atr = _wilder_smooth(tr, window).tolist()
             logger.info(f"Calculated ATR with {len(atr)} data points")
             return atr
         except Exception as e:
@@ -35,18 +49,17 @@ class VolatilityIndicatorsService:
         try:
             if len(prices) < window + 1:
                 return []
-            volatility = []
-            for i in range(window, len(prices)):
-                returns = []
-                for j in range(i - window, i):
-                    if prices[j] != 0:
-                        ret = (prices[j+1] - prices[j]) / prices[j]
-                        returns.append(ret)
-                if len(returns) > 0:
-                    vol = np.std(returns)
-                    volatility.append(vol * 100)
-                else:
-                    volatility.append(0)
+            prices = np.asarray(prices, dtype=np.float64)
+            valid = prices[:-1] != 0
+            returns = np.divide(np.diff(prices), prices[:-1], out=np.zeros(len(prices) - 1), where=valid)
+            valid_windows = sliding_window_view(valid, window)
+            return_windows = sliding_window_view(returns, window)
+            counts = valid_windows.sum(axis=1)
+            safe_counts = np.maximum(counts, 1)
+            means = return_windows.sum(axis=1) / safe_counts
+            deviations = np.where(valid_windows, return_windows - means[:, None], 0.0)
+            volatility = np.sqrt((deviations ** 2).sum(axis=1) / safe_counts) * 100
+            volatility = np.where(counts > 0, volatility, 0.0).tolist()
             logger.info(f"Calculated Historical Volatility with {len(volatility)} data points")
             return volatility
         except Exception as e:
@@ -58,13 +71,16 @@ class VolatilityIndicatorsService:
         try:
             if len(closes) < window:
                 return [], [], []
-            ema = pd.Series(closes).ewm(span=window, adjust=False).mean().tolist()
             atr = VolatilityIndicatorsService.calculate_atr(highs, lows, closes, 10)
             if len(atr) == 0:
+                logger.debug(f"Skipping Keltner Channels: {len(closes)} data points is too short for ATR(10)")
                 return [], [], []
+            atr = np.asarray(atr)
+            ema = pd.Series(closes).ewm(span=window, adjust=False).mean().to_numpy()
             ema_adjusted = ema[len(ema)-len(atr):]
-            upper = [ema_adjusted[i] + (atr[i] * atr_multiplier) for i in range(len(atr))]
-            lower = [ema_adjusted[i] - (atr[i] * atr_multiplier) for i in range(len(atr))]
+            upper = (ema_adjusted + (atr * atr_multiplier)).tolist()
+            lower = (ema_adjusted - (atr * atr_multiplier)).tolist()
+            ema_adjusted = ema_adjusted.tolist()
             logger.info(f"Calculated Keltner Channels with {len(upper)} data points")
             return upper, ema_adjusted, lower
         except Exception as e:
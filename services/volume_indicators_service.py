@@ -1,79 +1,70 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Dict, Tuple, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 class VolumeIndicatorsService:
     @staticmethod
-    def calculate_obv(prices: List[float], volumes: List[int]) -> List[float]:
+    def calculate_obv(prices: List[float], volumes: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
         try:
             if len(prices) != len(volumes) or len(prices) < 2:
-                return []
-            obv = [volumes[0]]
-            for i in range(1, len(prices)):
-                if prices[i] > prices[i-1]:
-                    obv.append(obv[-1] + volumes[i])
-                elif prices[i] < prices[i-1]:
-                    obv.append(obv[-1] - volumes[i])
-                else:
-                    obv.append(obv[-1])
-            logger.info(f"Calculated OBV with {len(obv)} data points")
-            return obv
+                return np.empty(0)
+            prices = np.asarray(prices, dtype=np.float64)
+            volumes = np.asarray(volumes, dtype=np.float64)
+            if out is None:
+                out = np.empty(len(prices), dtype=np.float64)
+            out[0] = volumes[0]
+            np.cumsum(np.nan_to_num(np.sign(np.diff(prices)), nan=0.0) * volumes[1:], out=out[1:])
+            out[1:] += volumes[0]
+            logger.info(f"Calculated OBV with {len(out)} data points")
+            return out
         except Exception as e:
             logger.error(f"Error calculating OBV: {str(e)}")
-            return []
+            return np.empty(0)
     
     @staticmethod
-    def calculate_ad(highs: List[float], lows: List[float], closes: List[float], volumes: List[int]) -> List[float]:
+    def calculate_ad(highs: List[float], lows: List[float], closes: List[float], volumes: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
         try:
             if len(highs) != len(lows) or len(lows) != len(closes) or len(closes) != len(volumes):
-                return []
+                return np.empty(0)
             if len(closes) < 1:
-                return []
-            ad = []
-            cum_ad = 0
-            for i in range(len(closes)):
-                high_low_range = highs[i] - lows[i]
-                if high_low_range == 0:
-                    clv = 0
-                else:
-                    clv = ((closes[i] - lows[i]) - (highs[i] - closes[i])) / high_low_range
-                ad_value = clv * volumes[i]
-                cum_ad += ad_value
-                ad.append(cum_ad)
-            logger.info(f"Calculated A/D with {len(ad)} data points")
-            return ad
+                return np.empty(0)
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            closes = np.asarray(closes, dtype=np.float64)
+            volumes = np.asarray(volumes, dtype=np.float64)
+            if out is None:
+                out = np.empty(len(closes), dtype=np.float64)
+            high_low_range = highs - lows
+            clv = np.divide((closes - lows) - (highs - closes), high_low_range, out=np.zeros_like(high_low_range), where=high_low_range != 0)
+            np.cumsum(clv * volumes, out=out)
+            logger.info(f"Calculated A/D with {len(out)} data points")
+            return out
         except Exception as e:
             logger.error(f"Error calculating A/D: {str(e)}")
-            return []
+            return np.empty(0)
     
     @staticmethod
     def calculate_mfi(highs: List[float], lows: List[float], closes: List[float], volumes: List[int], window: int = 14) -> List[float]:
         try:
             if len(closes) < window + 1:
                 return []
-            typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs, lows, closes)]
-            positive_mf = []
-            negative_mf = []
-            for i in range(1, len(typical_prices)):
-                mf = typical_prices[i] * volumes[i]
-                if typical_prices[i] > typical_prices[i-1]:
-                    positive_mf.append(mf)
-                    negative_mf.append(0)
-                else:
-                    positive_mf.append(0)
-                    negative_mf.append(mf)
-            mfi = []
-            for i in range(window - 1, len(positive_mf)):
-                pos_sum = sum(positive_mf[i-window+1:i+1])
-                neg_sum = sum(negative_mf[i-window+1:i+1])
-                if neg_sum == 0:
-                    mfi_value = 100
-                else:
-                    mfi_value = 100 - (100 / (1 + pos_sum / neg_sum))
-                mfi.append(mfi_value)
+            highs = np.asarray(highs, dtype=np.float64)
+            lows = np.asarray(lows, dtype=np.float64)
+            closes = np.asarray(closes, dtype=np.float64)
+            volumes = np.asarray(volumes, dtype=np.float64)
+            typical_prices = (highs + lows + closes) / 3
+            money_flow = typical_prices[1:] * volumes[1:]
+            rising = typical_prices[1:] > typical_prices[:-1]
+            positive_mf = np.where(rising, money_flow, 0.0)
+            negative_mf = np.where(rising, 0.0, money_flow)
+            pos_sum = sliding_window_view(positive_mf, window).sum(axis=1)
+            neg_sum = sliding_window_view(negative_mf, window).sum(axis=1)
+            money_ratio = np.divide(pos_sum, neg_sum, out=np.zeros_like(pos_sum), where=neg_sum != 0)
+            mfi = np.where(neg_sum == 0, 100.0, 100 - (100 / (1 + money_ratio))).tolist()
             logger.info(f"Calculated MFI with {len(mfi)} data points")
             return mfi
         except Exception as e:
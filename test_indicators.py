@@ -1,21 +1,266 @@
 #!/usr/bin/env python3
+import os
 import sys
-sys.path.insert(0, '.')
-
-print("Testing indicator services...")
-
-try:
-    from services.volatility_indicators_service import volatility_indicators_service
-    
-    # Test with sample data
-    highs = [100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114, 115]
-    lows = [99, 100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114]
-    closes = [100, 101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112, 113, 114, 115]
-    
-    result = volatility_indicators_service.calculate_atr(highs, lows, closes, 14)
-    print(f"✓ ATR calculated successfully: {result}")
-    
-except Exception as e:
-    print(f"✗ Error: {e}")
-    import traceback
-    traceback.print_exc()
+import numpy as np
+import pandas as pd
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.indicators_service import indicators_service
+from services.momentum_indicators_service import momentum_indicators_service
+from services.trend_indicators_service import trend_indicators_service
+from services.volatility_indicators_service import volatility_indicators_service
+from services.volume_indicators_service import volume_indicators_service
+
+# Reference implementations: the original per-bar loops the vectorised
+# and compiled kernels must keep matching, NaN handling included.
+
+def reference_obv(prices, volumes):
+    obv = [volumes[0]]
+    for i in range(1, len(prices)):
+        if prices[i] > prices[i-1]:
+            obv.append(obv[-1] + volumes[i])
+        elif prices[i] < prices[i-1]:
+            obv.append(obv[-1] - volumes[i])
+        else:
+            obv.append(obv[-1])
+    return obv
+
+def reference_ad(highs, lows, closes, volumes):
+    ad = []
+    cum_ad = 0
+    for i in range(len(closes)):
+        high_low_range = highs[i] - lows[i]
+        if high_low_range == 0:
+            clv = 0
+        else:
+            clv = ((closes[i] - lows[i]) - (highs[i] - closes[i])) / high_low_range
+        cum_ad += clv * volumes[i]
+        ad.append(cum_ad)
+    return ad
+
+def reference_mfi(highs, lows, closes, volumes, window=14):
+    typical_prices = [(h + l + c) / 3 for h, l, c in zip(highs, lows, closes)]
+    positive_mf = []
+    negative_mf = []
+    for i in range(1, len(typical_prices)):
+        mf = typical_prices[i] * volumes[i]
+        if typical_prices[i] > typical_prices[i-1]:
+            positive_mf.append(mf)
+            negative_mf.append(0)
+        else:
+            positive_mf.append(0)
+            negative_mf.append(mf)
+    mfi = []
+    for i in range(window - 1, len(positive_mf)):
+        pos_sum = sum(positive_mf[i-window+1:i+1])
+        neg_sum = sum(negative_mf[i-window+1:i+1])
+        mfi.append(100 if neg_sum == 0 else 100 - (100 / (1 + pos_sum / neg_sum)))
+    return mfi
+
+def reference_cci(highs, lows, closes, window=20):
+    cci = []
+    for i in range(window - 1, len(closes)):
+        typical_price = (highs[i] + lows[i] + closes[i]) / 3
+        sma = sum([(highs[j] + lows[j] + closes[j]) / 3 for j in range(i-window+1, i+1)]) / window
+        mad = sum([abs((highs[j] + lows[j] + closes[j]) / 3 - sma) for j in range(i-window+1, i+1)]) / window
+        cci.append(0 if mad == 0 else (typical_price - sma) / (0.015 * mad))
+    return cci
+
+def reference_roc(prices, window=12):
+    roc = []
+    for i in range(window, len(prices)):
+        if prices[i - window] == 0:
+            roc.append(0)
+        else:
+            roc.append(((prices[i] - prices[i - window]) / prices[i - window]) * 100)
+    return roc
+
+def reference_momentum(prices, window=12):
+    return [prices[i] - prices[i - window] for i in range(window, len(prices))]
+
+def reference_historical_volatility(prices, window=20):
+    volatility = []
+    for i in range(window, len(prices)):
+        returns = [(prices[j+1] - prices[j]) / prices[j] for j in range(i - window, i) if prices[j] != 0]
+        volatility.append(np.std(returns) * 100 if len(returns) > 0 else 0)
+    return volatility
+
+def reference_atr(highs, lows, closes, window=14):
+    tr = [max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1])) for i in range(1, len(closes))]
+    atr = []
+    if len(tr) >= window:
+        atr.append(sum(tr[:window]) / window)
+        for i in range(window, len(tr)):
+            atr.append((atr[-1] * (window - 1) + tr[i]) / window)
+    return atr
+
+def reference_keltner_channels(highs, lows, closes, window=20, atr_multiplier=2.0):
+    ema = pd.Series(closes).ewm(span=window, adjust=False).mean().tolist()
+    atr = reference_atr(highs, lows, closes, 10)
+    ema_adjusted = ema[len(ema)-len(atr):]
+    upper = [ema_adjusted[i] + (atr[i] * atr_multiplier) for i in range(len(atr))]
+    lower = [ema_adjusted[i] - (atr[i] * atr_multiplier) for i in range(len(atr))]
+    return upper, ema_adjusted, lower
+
+def reference_adx(highs, lows, closes, window=14):
+    tr = [max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1])) for i in range(1, len(closes))]
+    plus_dm = []
+    minus_dm = []
+    for i in range(1, len(highs)):
+        up_move = highs[i] - highs[i-1]
+        down_move = lows[i-1] - lows[i]
+        plus_dm.append(up_move if up_move > down_move and up_move > 0 else 0)
+        minus_dm.append(down_move if down_move > up_move and down_move > 0 else 0)
+    adx, plus_di, minus_di = [], [], []
+    tr_sum = sum(tr[:window])
+    plus_dm_sum = sum(plus_dm[:window])
+    minus_dm_sum = sum(minus_dm[:window])
+    for i in range(window - 1, len(tr)):
+        if i >= window:
+            tr_sum = tr_sum - tr[i-window] + tr[i]
+            plus_dm_sum = plus_dm_sum - plus_dm[i-window] + plus_dm[i]
+            minus_dm_sum = minus_dm_sum - minus_dm[i-window] + minus_dm[i]
+        plus_di_val = 100 * (plus_dm_sum / tr_sum) if tr_sum != 0 else 0
+        minus_di_val = 100 * (minus_dm_sum / tr_sum) if tr_sum != 0 else 0
+        plus_di.append(plus_di_val)
+        minus_di.append(minus_di_val)
+        di_sum = plus_di_val + minus_di_val
+        dx = 100 * abs(plus_di_val - minus_di_val) / di_sum if di_sum != 0 else 0
+        adx.append(dx if len(adx) < window else (adx[-1] * (window - 1) + dx) / window)
+    return adx, plus_di, minus_di
+
+def reference_supertrend(highs, lows, closes, window=10, multiplier=3.0):
+    hl2 = [(h + l) / 2 for h, l in zip(highs, lows)]
+    tr = [max(highs[i] - lows[i], abs(highs[i] - closes[i-1]), abs(lows[i] - closes[i-1])) for i in range(1, len(closes))]
+    hl2_ma = pd.Series(hl2).rolling(window=window).mean().tolist()
+    atr_ma = pd.Series(tr).rolling(window=window).mean().tolist()
+    supertrend = []
+    trend = []
+    for i in range(1, len(hl2_ma)):
+        upper_band = hl2_ma[i] + (multiplier * atr_ma[i-1])
+        lower_band = hl2_ma[i] - (multiplier * atr_ma[i-1])
+        supertrend.append(upper_band if closes[i] <= upper_band else lower_band)
+        trend.append("down" if closes[i] <= upper_band else "up")
+    return supertrend, trend
+
+def reference_ichimoku(highs, lows, closes):
+    lines = {}
+    for line, window in (("tenkan", 9), ("kijun", 26), ("senkou_b", 52)):
+        lines[line] = [(max(highs[i-window+1:i+1]) + min(lows[i-window+1:i+1])) / 2 for i in range(window - 1, len(closes))]
+    lines["senkou_a"] = [(lines["tenkan"][i] + lines["kijun"][i]) / 2 for i in range(len(lines["kijun"]))]
+    lines["chikou"] = closes[:-26]
+    return lines
+
+def make_cases():
+    """Sample OHLCV series: random walk, flat prices, a NaN close and a fully missing bar"""
+    rng = np.random.default_rng(0)
+    closes = 100 + np.cumsum(rng.normal(0, 1, 120))
+    highs = closes + rng.uniform(0, 2, 120)
+    lows = closes - rng.uniform(0, 2, 120)
+    volumes = rng.integers(100000, 1000000, 120).astype(float)
+    cases = {"random_walk": (highs, lows, closes, volumes)}
+    flat = np.full(60, 50.0)
+    cases["flat"] = (flat, flat.copy(), flat.copy(), volumes[:60])
+    ramp = np.arange(100, 140, dtype=np.float64)
+    nan_close = ramp.copy()
+    nan_close[5] = np.nan
+    cases["nan_close"] = (ramp + 1, ramp - 1, nan_close, volumes[:40])
+    missing = tuple(series.copy() for series in cases["random_walk"][:3])
+    for series in missing:
+        series[30] = np.nan
+    cases["missing_bar"] = missing + (volumes,)
+    return {name: tuple(series.tolist() for series in case) for name, case in cases.items()}
+
+def assert_same(actual, expected, label=""):
+    actual = np.asarray(actual, dtype=np.float64)
+    expected = np.asarray(expected, dtype=np.float64)
+    assert actual.shape == expected.shape, f"{label}: {actual.shape} != {expected.shape}"
+    np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True, err_msg=label)
+
+def test_atr_sample():
+    highs = np.arange(100, 116, dtype=np.float32)
+    lows = np.arange(99, 115, dtype=np.float32)
+    closes = highs.copy()
+    assert volatility_indicators_service.calculate_atr(highs, lows, closes, 14) == [1.0, 1.0]
+
+def test_atr_skips_nan_previous_close():
+    ramp = np.arange(100, 120, dtype=np.float64)
+    closes = ramp.copy()
+    closes[5] = np.nan
+    atr = volatility_indicators_service.calculate_atr((ramp + 1).tolist(), (ramp - 1).tolist(), closes.tolist(), 5)
+    assert atr == [2.0] * 15
+
+def test_adx_skips_nan_previous_close():
+    ramp = np.arange(100, 140, dtype=np.float64)
+    closes = ramp.copy()
+    closes[5] = np.nan
+    adx, plus_di, minus_di = trend_indicators_service.calculate_adx((ramp + 1).tolist(), (ramp - 1).tolist(), closes.tolist(), 5)
+    assert adx == [100.0] * len(adx) and plus_di == [50.0] * len(plus_di)
+
+def test_supertrend_skips_nan_previous_close():
+    ramp = np.arange(100, 120, dtype=np.float64)
+    closes = ramp.copy()
+    closes[5] = np.nan
+    supertrend, trend = trend_indicators_service.calculate_supertrend((ramp + 1).tolist(), (ramp - 1).tolist(), closes.tolist(), 5)
+    assert supertrend[5:10] == [110.0, 111.0, 112.0, 113.0, 114.0]
+    assert trend[5:10] == ["down"] * 5
+
+def test_latest_ema_with_nan_bar():
+    prices = np.linspace(80, 90, 300)
+    prices[150] = np.nan
+    expected = pd.Series(prices).ewm(span=20, adjust=False).mean().iloc[-1]
+    result = indicators_service.calculate_latest_ema(prices, 20)
+    assert np.isfinite(result) and np.isclose(result, expected)
+
+def test_all_indicators_cache_keys_on_high_low_close():
+    closes = np.linspace(100, 120, 60)
+    index = pd.date_range("2024-01-01", periods=60)
+    df = pd.DataFrame({"High": closes + 1, "Low": closes - 1, "Close": closes}, index=index)
+    wide = df.assign(High=closes + 5, Low=closes - 5)
+    assert indicators_service.get_all_indicators(df)["atr"] != indicators_service.get_all_indicators(wide)["atr"]
+    df.loc[index[10], "Close"] = np.nan
+    assert indicators_service.get_all_indicators(df) == indicators_service.get_all_indicators(df.copy())
+
+def test_kernels_match_reference_loops():
+    for name, (highs, lows, closes, volumes) in make_cases().items():
+        for window in (3, 14):
+            checks = [
+                ("mfi", volume_indicators_service.calculate_mfi(highs, lows, closes, volumes, window), reference_mfi(highs, lows, closes, volumes, window)),
+                ("cci", momentum_indicators_service.calculate_cci(highs, lows, closes, window), reference_cci(highs, lows, closes, window)),
+                ("roc", momentum_indicators_service.calculate_roc(closes, window), reference_roc(closes, window)),
+                ("momentum", momentum_indicators_service.calculate_momentum(closes, window), reference_momentum(closes, window)),
+                ("atr", volatility_indicators_service.calculate_atr(highs, lows, closes, window), reference_atr(highs, lows, closes, window)),
+                ("historical_volatility", volatility_indicators_service.calculate_historical_volatility(closes, window), reference_historical_volatility(closes, window)),
+            ]
+            for indicator, actual, expected in checks:
+                assert_same(actual, expected, f"{indicator}/{name}/{window}")
+            adx = trend_indicators_service.calculate_adx(highs, lows, closes, window)
+            for actual, expected in zip(adx, reference_adx(highs, lows, closes, window)):
+                assert_same(actual, expected, f"adx/{name}/{window}")
+            supertrend, trend = trend_indicators_service.calculate_supertrend(highs, lows, closes, window)
+            expected_supertrend, expected_trend = reference_supertrend(highs, lows, closes, window)
+            assert_same(supertrend, expected_supertrend, f"supertrend/{name}/{window}")
+            assert trend == expected_trend, f"supertrend trend/{name}/{window}"
+            keltner = volatility_indicators_service.calculate_keltner_channels(highs, lows, closes, window)
+            for actual, expected in zip(keltner, reference_keltner_channels(highs, lows, closes, window)):
+                assert_same(actual, expected, f"keltner/{name}/{window}")
+        if len(closes) >= 52:
+            ichimoku = trend_indicators_service.calculate_ichimoku(highs, lows, closes)
+            for line, expected in reference_ichimoku(highs, lows, closes).items():
+                assert_same(ichimoku[line], expected, f"ichimoku {line}/{name}")
+        assert_same(volume_indicators_service.calculate_obv(closes, volumes), reference_obv(closes, volumes), f"obv/{name}")
+        assert_same(volume_indicators_service.calculate_ad(highs, lows, closes, volumes), reference_ad(highs, lows, closes, volumes), f"ad/{name}")
+
+if __name__ == "__main__":
+    print("Testing indicator services...")
+    failed = False
+    for test in (test_atr_sample, test_atr_skips_nan_previous_close, test_adx_skips_nan_previous_close, test_supertrend_skips_nan_previous_close, test_latest_ema_with_nan_bar, test_all_indicators_cache_keys_on_high_low_close, test_kernels_match_reference_loops):
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+        except Exception as e:
+            failed = True
+            print(f"✗ {test.__name__}: {e}")
+            import traceback
+            traceback.print_exc()
+    sys.exit(1 if failed else 0)